@@ -0,0 +1,319 @@
+"""
+Writes precomputed static exports of the combined events: per-day and per-tag
+JSON shards with content hashes in their filenames, a small manifest, and a
+combined iCalendar feed that calendar apps can subscribe to.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+COLUMNS = ["Date", "Time", "Title", "Location", "Description", "Tags", "Link"]
+HASH_LENGTH = 12
+TIMEZONE = "America/New_York"
+# Fixed creation stamp for every VEVENT so an unchanged feed stays byte-identical
+ICS_DTSTAMP = "19700101T000000Z"
+
+VTIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TIMEZONE}",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:-0500",
+    "TZOFFSETTO:-0400",
+    "TZNAME:EDT",
+    "DTSTART:20070311T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:-0400",
+    "TZOFFSETTO:-0500",
+    "TZNAME:EST",
+    "DTSTART:20071104T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+]
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def _slugify(value: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+    return slug or "untagged"
+
+
+def _to_json_bytes(payload) -> bytes:
+    # Stable key order and separators so identical content hashes identically
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """Write data to path unless the file already holds exactly these bytes."""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    _atomic_write(path, data)
+    return True
+
+
+def _write_shard(shard_dir: str, key: str, events: list) -> tuple:
+    """Write one hashed JSON shard. Returns (relative filename, written)."""
+    data = _to_json_bytes(events)
+    filename = f"{_slugify(key)}.{_content_hash(data)}.json"
+    path = os.path.join(shard_dir, filename)
+    # The hash is in the name, so an existing file already has these contents
+    if os.path.exists(path):
+        return filename, False
+    _atomic_write(path, data)
+    return filename, True
+
+
+def _read_manifest(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def _shard_files(manifest: dict, section: str) -> set:
+    return {os.path.basename(entry["file"]) for entry in manifest.get(section, {}).values()}
+
+
+def _prune_shards(shard_dir: str, keep: set) -> int:
+    """Remove shards not in keep, plus temp files left by an interrupted run."""
+    removed = 0
+    for filename in os.listdir(shard_dir):
+        if filename.endswith(".tmp") or (filename.endswith(".json") and filename not in keep):
+            os.remove(os.path.join(shard_dir, filename))
+            removed += 1
+    return removed
+
+
+def _split_tags(tags: str) -> list:
+    return [tag.strip() for tag in tags.split(",") if tag.strip()]
+
+
+def _parse_date(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _parse_clock(value: str):
+    value = value.strip().upper()
+    for fmt in ("%I:%M %p", "%I %p", "%I:%M%p", "%I%p"):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_time_range(time_str: str) -> tuple:
+    """Parse '11:00 AM', '11:00AM-1:00PM' or '11 AM to 1 PM' into (start, end) times."""
+    parts = [part for part in re.split(r"\s*(?:[-–]|to)\s*", time_str.strip(), flags=re.IGNORECASE) if part]
+    start = _parse_clock(parts[0]) if parts else None
+    end = _parse_clock(parts[1]) if len(parts) > 1 and start else None
+    return start, end
+
+
+def _ics_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_fold(line: str) -> str:
+    """Fold a content line at 75 octets as required by RFC 5545."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    chunks = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+def _ics_event_lines(event: dict):
+    day = _parse_date(event["Date"])
+    if day is None:
+        return
+    start, end = _parse_time_range(event["Time"])
+    uid_source = "|".join(event[col] for col in ("Date", "Time", "Title", "Location"))
+    uid = hashlib.sha1(uid_source.encode("utf-8")).hexdigest()
+
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}@phillykidcal"
+    yield f"DTSTAMP:{ICS_DTSTAMP}"
+    if start:
+        begin = datetime.combine(day.date(), start)
+        yield f"DTSTART;TZID={TIMEZONE}:{begin.strftime('%Y%m%dT%H%M%S')}"
+        if end:
+            finish = datetime.combine(day.date(), end)
+            if finish < begin:
+                finish += timedelta(days=1)
+            yield f"DTEND;TZID={TIMEZONE}:{finish.strftime('%Y%m%dT%H%M%S')}"
+    else:
+        yield f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}"
+        yield f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}"
+    yield f"SUMMARY:{_ics_escape(event['Title'])}"
+    if event["Location"]:
+        yield f"LOCATION:{_ics_escape(event['Location'])}"
+    if event["Description"]:
+        yield f"DESCRIPTION:{_ics_escape(event['Description'])}"
+    tags = _split_tags(event["Tags"])
+    if tags:
+        yield "CATEGORIES:" + ",".join(_ics_escape(tag) for tag in tags)
+    if event["Link"]:
+        yield f"URL:{event['Link']}"
+    yield "END:VEVENT"
+
+
+def _iter_exported_events(static_dir: str):
+    """Yield events from every exported month's day shards, in date order."""
+    for month in sorted(os.listdir(static_dir)):
+        month_dir = os.path.join(static_dir, month)
+        if not os.path.isdir(month_dir):
+            continue
+        manifest = _read_manifest(os.path.join(month_dir, "manifest.json"))
+        for day in sorted(manifest.get("days", {})):
+            with open(os.path.join(month_dir, manifest["days"][day]["file"]), encoding="utf-8") as f:
+                yield from json.load(f)
+
+
+def _write_ics(path: str, events) -> tuple:
+    """
+    Stream the combined feed to a temp file one line at a time while hashing it,
+    then only replace the published file if the hash changed.
+    Returns (content hash, written).
+    """
+    digest = hashlib.sha256()
+    tmp_path = f"{path}.tmp"
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//PhillyKidCal//Kids Events//EN",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:PhillyKidCal",
+        f"X-WR-TIMEZONE:{TIMEZONE}",
+    ] + VTIMEZONE
+    with open(tmp_path, "wb") as f:
+        def emit(line):
+            data = _ics_fold(line).encode("utf-8")
+            digest.update(data)
+            f.write(data)
+
+        for line in header:
+            emit(line)
+        for event in events:
+            for line in _ics_event_lines(event):
+                emit(line)
+        emit("END:VCALENDAR")
+
+    ics_hash = digest.hexdigest()[:HASH_LENGTH]
+    if os.path.exists(path):
+        with open(path, "rb") as existing:
+            old_hash = hashlib.sha256()
+            for block in iter(lambda: existing.read(65536), b""):
+                old_hash.update(block)
+        if old_hash.hexdigest()[:HASH_LENGTH] == ics_hash:
+            os.remove(tmp_path)
+            return ics_hash, False
+    os.replace(tmp_path, path)
+    return ics_hash, True
+
+
+def run_static_export(df: pd.DataFrame, mnth: int, yr: int, output_dir="data"):
+    """
+    Export the combined events for one month as static files under
+    {output_dir}/static/{yr}_{mnth}/:
+
+    - days/<date>.<hash>.json   events for one day
+    - tags/<tag>.<hash>.json    events carrying one tag
+    - manifest.json             maps days and tags to their current shard files
+
+    and rebuild {output_dir}/static/kids_events.ics, a combined iCalendar feed
+    of every exported month that keeps one URL for calendar subscriptions.
+
+    Only shards whose contents changed are written. The manifest is replaced
+    only after every shard it references exists, and shards referenced by
+    neither the new nor the previous manifest are removed afterwards, so
+    clients holding either manifest never hit a missing file.
+    """
+    mnth = f"{int(mnth):02d}"
+    static_dir = os.path.join(output_dir, "static")
+    export_dir = os.path.join(static_dir, f"{yr}_{mnth}")
+    day_dir = os.path.join(export_dir, "days")
+    tag_dir = os.path.join(export_dir, "tags")
+    os.makedirs(day_dir, exist_ok=True)
+    os.makedirs(tag_dir, exist_ok=True)
+    manifest_path = os.path.join(export_dir, "manifest.json")
+    previous = _read_manifest(manifest_path)
+
+    records = (
+        df.reindex(columns=COLUMNS)
+        .fillna("")
+        .astype(str)
+        .to_dict(orient="records")
+    )
+
+    by_day = {}
+    by_tag = {}
+    for event in records:
+        if _parse_date(event["Date"]) is not None:
+            by_day.setdefault(event["Date"], []).append(event)
+        for tag in _split_tags(event["Tags"]):
+            by_tag.setdefault(tag, []).append(event)
+
+    written = 0
+    manifest = {"month": f"{yr}-{mnth}", "days": {}, "tags": {}}
+
+    for day in sorted(by_day):
+        filename, changed = _write_shard(day_dir, day, by_day[day])
+        manifest["days"][day] = {"file": f"days/{filename}", "count": len(by_day[day])}
+        written += changed
+
+    for tag in sorted(by_tag):
+        filename, changed = _write_shard(tag_dir, tag, by_tag[tag])
+        manifest["tags"][tag] = {"file": f"tags/{filename}", "count": len(by_tag[tag])}
+        written += changed
+
+    written += _write_if_changed(manifest_path, _to_json_bytes(manifest))
+
+    # Built from the manifests on disk so the feed covers every exported month
+    _, changed = _write_ics(os.path.join(static_dir, "kids_events.ics"), _iter_exported_events(static_dir))
+    written += changed
+
+    removed = _prune_shards(day_dir, _shard_files(manifest, "days") | _shard_files(previous, "days"))
+    removed += _prune_shards(tag_dir, _shard_files(manifest, "tags") | _shard_files(previous, "tags"))
+    print(f"✅ Static export at {export_dir} ({written} files updated, {removed} removed)")
+    return manifest
@@ -1,6 +1,7 @@
 from scrapers.macaroni_kid import run_macaroni_kid
 from scrapers.mommy_poppins import run_mommy_poppins
 from scrapers.philly_fam import run_philly_fam
+from exporters.static_export import run_static_export
 
 from datetime import datetime
 from glob import glob
@@ -74,3 +75,6 @@ print(f"✅ Combined CSV created at {outfile}")
 excel_outfile = outfile.replace(".csv", ".xlsx")
 combined_df.to_excel(excel_outfile, index=False, engine='openpyxl')
 print(f"✅ Combined Excel file created at {excel_outfile}")
+
+# Output per-day/per-tag JSON shards, manifest and combined iCal feed
+run_static_export(combined_df, mnth, yr)
@@ -0,0 +1,238 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from exporters import static_export
+from exporters.static_export import run_static_export
+
+
+@pytest.fixture
+def events_df():
+    """
+    A small combined DataFrame in the same shape main.py produces.
+    """
+    return pd.DataFrame(
+        [
+            {
+                "Date": "2024-06-10",
+                "Time": "10:00 AM - 12:00 PM",
+                "Title": "Story Time",
+                "Location": "Free Library",
+                "Description": "Songs, stories; and crafts",
+                "Tags": "Free, Family",
+                "Link": "https://example.com/story",
+            },
+            {
+                "Date": "2024-06-11",
+                "Time": "N/A",
+                "Title": "Zoo Day",
+                "Location": "Philadelphia Zoo",
+                "Description": None,
+                "Tags": "Family",
+                "Link": "https://example.com/zoo",
+            },
+        ]
+    )
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+
+
+def test_run_static_export_writes_shards_and_manifest(events_df, tmp_path):
+    """
+    Test that run_static_export writes one shard per day and per tag, and a
+    manifest pointing at hashed filenames that exist on disk.
+    """
+    manifest = run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    export_dir = tmp_path / "static" / "2024_06"
+
+    with open(export_dir / "manifest.json", encoding="utf-8") as f:
+        assert json.load(f) == manifest
+
+    assert set(manifest["days"]) == {"2024-06-10", "2024-06-11"}
+    assert set(manifest["tags"]) == {"Free", "Family"}
+    assert manifest["tags"]["Family"]["count"] == 2
+
+    day_file = manifest["days"]["2024-06-10"]["file"]
+    assert day_file.startswith("days/2024-06-10.") and day_file.endswith(".json")
+    with open(export_dir / day_file, encoding="utf-8") as f:
+        day_events = json.load(f)
+    assert [e["Title"] for e in day_events] == ["Story Time"]
+
+    with open(export_dir / manifest["days"]["2024-06-11"]["file"], encoding="utf-8") as f:
+        assert json.load(f)[0]["Description"] == ""
+
+
+def test_run_static_export_writes_ics(events_df, tmp_path):
+    """
+    Test that the combined iCal feed contains timed and all-day events with
+    escaped text and CRLF line endings.
+    """
+    run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    with open(tmp_path / "static" / "kids_events.ics", "rb") as f:
+        ics = f.read().decode("utf-8")
+
+    assert ics.startswith("BEGIN:VCALENDAR\r\n")
+    assert ics.endswith("END:VCALENDAR\r\n")
+    assert ics.count("BEGIN:VEVENT") == 2
+    assert "BEGIN:VTIMEZONE\r\nTZID:America/New_York\r\n" in ics
+    assert "DTSTART;TZID=America/New_York:20240610T100000\r\n" in ics
+    assert "DTEND;TZID=America/New_York:20240610T120000\r\n" in ics
+    assert ics.count("DTSTAMP:19700101T000000Z\r\n") == 2
+    assert "DTSTART;VALUE=DATE:20240611\r\n" in ics
+    assert "DESCRIPTION:Songs\\, stories\\; and crafts\r\n" in ics
+
+
+def test_run_static_export_only_rewrites_changed_shards(events_df, tmp_path):
+    """
+    Test that a second export only rewrites shards whose contents changed,
+    keeps the previous generation's shards, and removes them one run later.
+    """
+    first = run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    export_dir = tmp_path / "static" / "2024_06"
+    unchanged = export_dir / first["days"]["2024-06-11"]["file"]
+    mtime = os.stat(unchanged).st_mtime_ns
+
+    events_df.loc[0, "Title"] = "Story Time (Updated)"
+    second = run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+
+    assert second["days"]["2024-06-11"] == first["days"]["2024-06-11"]
+    assert os.stat(unchanged).st_mtime_ns == mtime
+    assert second["days"]["2024-06-10"] != first["days"]["2024-06-10"]
+    assert os.path.exists(export_dir / first["days"]["2024-06-10"]["file"])
+
+    events_df.loc[0, "Title"] = "Story Time (Updated Again)"
+    run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    assert not os.path.exists(export_dir / first["days"]["2024-06-10"]["file"])
+    assert os.path.exists(export_dir / second["days"]["2024-06-10"]["file"])
+
+
+def test_run_static_export_identical_input_writes_nothing(events_df, tmp_path):
+    """
+    Test that re-running the export on the same DataFrame leaves every file
+    untouched and leaves no temp files behind.
+    """
+    run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    static_dir = tmp_path / "static"
+    files = [path for path in static_dir.rglob("*") if path.is_file()]
+    mtimes = {path: os.stat(path).st_mtime_ns for path in files}
+
+    run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+
+    assert static_dir / "kids_events.ics" in mtimes
+    assert static_dir / "2024_06" / "manifest.json" in mtimes
+    assert sorted(path for path in static_dir.rglob("*") if path.is_file()) == sorted(files)
+    assert all(os.stat(path).st_mtime_ns == mtime for path, mtime in mtimes.items())
+    assert not list(static_dir.rglob("*.tmp"))
+
+
+def test_run_static_export_feed_covers_every_month(events_df, tmp_path):
+    """
+    Test that the subscribable feed keeps one path and includes events from
+    every exported month, not just the latest one.
+    """
+    run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    july_df = pd.DataFrame(
+        [
+            {
+                "Date": "2024-07-04",
+                "Time": "9:00 PM",
+                "Title": "Fireworks",
+                "Location": "Penn's Landing",
+                "Description": "",
+                "Tags": "Free",
+                "Link": "",
+            }
+        ]
+    )
+    run_static_export(july_df, mnth=7, yr=2024, output_dir=tmp_path)
+
+    with open(tmp_path / "static" / "kids_events.ics", "rb") as f:
+        ics = f.read().decode("utf-8")
+    assert ics.count("BEGIN:VEVENT") == 3
+    assert ics.index("SUMMARY:Story Time") < ics.index("SUMMARY:Fireworks")
+    assert not (tmp_path / "static" / "2024_07" / "kids_events.ics").exists()
+
+
+def test_run_static_export_colliding_tag_slugs_get_own_shards(events_df, tmp_path):
+    """
+    Test that tags whose slugs collide each get a shard holding only their own
+    events, with matching counts.
+    """
+    events_df.loc[0, "Tags"] = "Arts & Crafts"
+    events_df.loc[1, "Tags"] = "Arts/Crafts"
+    manifest = run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    export_dir = tmp_path / "static" / "2024_06"
+
+    amp, slash = manifest["tags"]["Arts & Crafts"], manifest["tags"]["Arts/Crafts"]
+    assert amp["file"] != slash["file"]
+    assert amp["count"] == slash["count"] == 1
+    with open(export_dir / amp["file"], encoding="utf-8") as f:
+        assert [e["Title"] for e in json.load(f)] == ["Story Time"]
+    with open(export_dir / slash["file"], encoding="utf-8") as f:
+        assert [e["Title"] for e in json.load(f)] == ["Zoo Day"]
+
+
+@pytest.mark.parametrize(
+    "time_str, expected",
+    [
+        ("10:00 AM - 12:00 PM", ("10:00", "12:00")),
+        ("11:00AM-1:00PM", ("11:00", "13:00")),
+        ("10:00 AM to 12:00 PM", ("10:00", "12:00")),
+        ("10 AM – 2 PM", ("10:00", "14:00")),
+        ("7:00 PM", ("19:00", None)),
+        ("N/A", (None, None)),
+    ],
+)
+def test_parse_time_range(time_str, expected):
+    """
+    Test that time ranges parse with or without spaces around the dash and
+    with 'to' as the separator.
+    """
+    start, end = static_export._parse_time_range(time_str)
+    as_str = lambda t: t.strftime("%H:%M") if t else None
+    assert (as_str(start), as_str(end)) == expected
+
+
+def test_run_static_export_manifest_never_references_missing_file(events_df, tmp_path, monkeypatch):
+    """
+    Test that whenever shards are pruned, the manifest on disk only references
+    files that exist, and leftover temp files are cleaned up.
+    """
+    export_dir = tmp_path / "static" / "2024_06"
+    prune_shards = static_export._prune_shards
+
+    def checked_prune(shard_dir, keep):
+        with open(export_dir / "manifest.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+        removed = prune_shards(shard_dir, keep)
+        for section in ("days", "tags"):
+            for entry in manifest[section].values():
+                assert os.path.exists(export_dir / entry["file"])
+        return removed
+
+    monkeypatch.setattr(static_export, "_prune_shards", checked_prune)
+
+    run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+    (export_dir / "days" / "2024-06-10.abc.json.tmp").write_bytes(b"partial")
+    for title in ("Story Time (Updated)", "Story Time (Updated Again)"):
+        events_df.loc[0, "Title"] = title
+        run_static_export(events_df, mnth=6, yr=2024, output_dir=tmp_path)
+
+    assert not list(export_dir.rglob("*.tmp"))
+
+
+def test_ics_fold_long_lines():
+    """
+    Test that content lines longer than 75 octets are folded without
+    splitting multi-byte characters.
+    """
+    folded = static_export._ics_fold("DESCRIPTION:" + "é" * 80)
+    lines = folded.rstrip("\r\n").split("\r\n")
+    assert len(lines) > 1
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert "".join(line[1:] if i else line for i, line in enumerate(lines)) == "DESCRIPTION:" + "é" * 80